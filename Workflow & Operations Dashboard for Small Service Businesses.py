@@ -3,19 +3,38 @@
 from __future__ import annotations
 
 import os
+import threading
 from dataclasses import dataclass
 from datetime import date, datetime
 from typing import List, Optional
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+try:
+    from st_keyup import st_keyup as _st_keyup
+except ImportError:  # optional dependency; the stock text_input still works
+    _st_keyup = None
+
+try:
+    from rapidfuzz import fuzz as _rf_fuzz, process as _rf_process, utils as _rf_utils
+except ImportError:  # optional dependency; search stays exact-match without it
+    _rf_fuzz = _rf_process = _rf_utils = None
+
 # Config
 st.set_page_config(page_title="Service Workflow Dashboard", layout="wide")
 
 DATA_DIR = "data"
-CUSTOM_FILE = os.path.join(DATA_DIR, "custom_jobs.csv")
-REPAIR_FILE = os.path.join(DATA_DIR, "repair_jobs.csv")
+CUSTOM_FILE = os.path.join(DATA_DIR, "custom_jobs.parquet")
+REPAIR_FILE = os.path.join(DATA_DIR, "repair_jobs.parquet")
+
+# rows per editor page; render/diff cost scales with this, not table size
+PAGE_SIZE = 20
+
+# money columns must stay float64 all the way to the Parquet writer —
+# seeding them with "" makes to_parquet fail on the mixed object column
+MONEY_COLS = ("Total_Price", "Deposit_Paid", "Remaining_Balance")
 
 CUSTOM_STATUSES = [
     "Consultation",
@@ -42,27 +61,47 @@ def today_str() -> str:
     return date.today().isoformat()
 
 
-def safe_float(x) -> float:
-    try:
-        return float(x)
-    except Exception:
-        return 0.0
+@st.cache_data(show_spinner=False)
+def _read_table_cached(path, mtime):
+    # mtime keys the cache entry so on-disk edits still invalidate it.
+    return pd.read_parquet(path)
 
 
-def compute_remaining(total,deposit):
-    rem = total - deposit
-    if rem >= 0:
-        return rem
-    else:
-        return 0.0
+def _with_status_cat(df, kind):
+    # Status has a small fixed vocabulary; a categorical stores one code per
+    # row instead of one string object, and makes isin/value_counts cheaper.
+    if "Status" in df.columns:
+        order = CUSTOM_STATUSES if kind == "custom" else REPAIR_STATUSES
+        df["Status"] = pd.Categorical(df["Status"], categories=order)
+    return df
+
+
+def _coerce_money(df):
+    # Coerce once where data enters the system; everything downstream can
+    # assume float64 money columns and skip per-rerun to_numeric passes.
+    for c in MONEY_COLS:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0.0)
+        else:
+            df[c] = 0.0
+    return df
 
 
-def load_or_init_csv(path,kind):
+def load_or_init(path,kind):
     ensure_data_dir()
     if os.path.exists(path):
-        df = pd.read_csv(path)
+        # copy so session-state mutations can't poison the cached frame
+        return _coerce_money(_with_status_cat(_read_table_cached(path, os.path.getmtime(path)).copy(), kind))
+
+    # one-time migration from the old CSV store
+    legacy = os.path.splitext(path)[0] + ".csv"
+    if os.path.exists(legacy):
+        df = pd.read_csv(legacy)
         df.columns = [c.strip() for c in df.columns]
-        return df
+        save_table(df, path)
+        # retire the CSV so a later demo reset cannot resurrect stale rows
+        os.replace(legacy, legacy + ".bak")
+        return _coerce_money(_with_status_cat(df, kind))
     else:
         cols = ["Order_ID", "Client", "Item", "Assigned_To", "Status", "Intake_Date", "Due_Date", "Total_Price", "Deposit_Paid", "Remaining_Balance", "Paid", "Notes"]
         df = pd.DataFrame(columns=cols)                
@@ -99,12 +138,137 @@ def load_or_init_csv(path,kind):
             ]
         )
 
-    df.to_csv(path, index=False)
-    return df
+    save_table(df, path)
+    return _coerce_money(_with_status_cat(df, kind))
+
+@st.cache_data(show_spinner=False, hash_funcs={
+    pd.DataFrame: lambda d: (len(d), pd.util.hash_pandas_object(d, index=False).sum())
+})
+def _csv_bytes(df):
+    # Serialized once per table content; reruns that do not change the data
+    # reuse the cached bytes instead of re-encoding on every keystroke.
+    return df.to_csv(index=False).encode("utf-8")
 
-def save_csv(df,path):
+def save_table(df,path):
     ensure_data_dir()
-    df.to_csv(path, index=False)
+    df.to_parquet(path, engine="pyarrow", compression="zstd")
+
+def _frame_fingerprint(df):
+    # cheap content hash used to skip rewrites when nothing actually changed
+    return int(pd.util.hash_pandas_object(df, index=False).sum())
+
+def append_row_store(path, df):
+    # Parquet has no line-append, so an add persists a snapshot of the frame
+    # (which already contains the new row) and drops the stale cache entry.
+    save_table(df, path)
+    _read_table_cached.clear()
+
+def _paid_col(rem):
+    # one vectorized comparison instead of a Python call per row; a two-level
+    # categorical so the column holds codes, not repeated strings
+    return pd.Categorical(
+        np.where(rem.to_numpy() == 0.0, "Yes", "No"), categories=["Yes", "No"]
+    )
+
+
+@st.cache_data(
+    show_spinner=False,
+    hash_funcs={pd.DataFrame: lambda d: (len(d), pd.util.hash_pandas_object(d, index=False).sum())},
+)
+def _search_index(df, search_cols):
+    # Lowercased fused haystack as a fixed-width numpy array, built once per
+    # table content; the keystroke path then runs a single C scan over it.
+    # A fresh seed frame may lack some search columns — skip those.
+    cols = [c for c in search_cols if c in df.columns]
+    hay = df[cols[0]].astype(str)
+    for c in cols[1:]:
+        hay = hay + "\x1f" + df[c].astype(str)
+    return np.asarray(hay.str.lower(), dtype="U")
+
+
+@st.cache_data(
+    show_spinner=False,
+    hash_funcs={pd.Series: lambda s: (len(s), pd.util.hash_pandas_object(s, index=False).sum())},
+)
+def _unique_values(s):
+    # deduped once per column content so the fuzzy path never re-dedups
+    # while the user is typing
+    return s.dropna().astype(str).unique().tolist()
+
+
+@st.cache_data(
+    show_spinner=False,
+    hash_funcs={pd.DataFrame: lambda d: (len(d), pd.util.hash_pandas_object(d, index=False).sum())},
+)
+def _normalize_and_filter(df, f_status, f_paid, f_search, search_cols):
+    # Pure function of (frame, filter widgets): reruns that don't touch the
+    # data or the filters (form typing, tab switches) hit the cache. Money
+    # columns are already float64 — coerced once at the load/edit boundary.
+    # np.maximum on the raw array skips Series.clip's alignment overhead
+    df = df.assign(Remaining_Balance=np.maximum((df["Total_Price"] - df["Deposit_Paid"]).to_numpy(), 0.0))
+    df = df.assign(Paid=_paid_col(df["Remaining_Balance"]))
+
+    df = df[df["Status"].isin(f_status)]
+    if f_paid == "Paid":
+        df = df[df["Paid"] == "Yes"]
+    elif f_paid == "Unpaid":
+        df = df[df["Paid"] == "No"]
+
+    if f_search.strip():
+        q = f_search.strip().lower()
+        mask = np.char.find(_search_index(df, search_cols), q) >= 0
+        if not mask.any() and _rf_process is not None:
+            # round 2: no exact hit, fall back to typo-tolerant matching
+            # against the cached unique values of each search column
+            near = set()
+            for c in (c for c in search_cols if c in df.columns):
+                # default_process lowercases both sides; rapidfuzz 3.x no
+                # longer does that on its own, and q is already lowercased
+                hits = _rf_process.extract(
+                    q,
+                    _unique_values(df[c]),
+                    scorer=_rf_fuzz.WRatio,
+                    processor=_rf_utils.default_process,
+                    score_cutoff=75,
+                )
+                near.update(h[0] for h in hits)
+            if near:
+                present = [c for c in search_cols if c in df.columns]
+                mask = df[present[0]].astype(str).isin(near)
+                for c in present[1:]:
+                    mask |= df[c].astype(str).isin(near)
+        df = df[mask]
+
+    return df
+
+def _search_input(label, **kwargs):
+    # With st-keyup installed, typing is debounced so a word costs one
+    # filtered rerun instead of one per keystroke; otherwise fall back to the
+    # stock text_input (which reruns on every edit).
+    if _st_keyup is not None:
+        return _st_keyup(label, debounce=250, **kwargs) or ""
+    return st.text_input(label, **kwargs)
+
+@st.cache_data(
+    show_spinner=False,
+    hash_funcs={pd.DataFrame: lambda d: (len(d), pd.util.hash_pandas_object(d, index=False).sum())},
+)
+def _stage_counts(df, order):
+    # memoized by table content: reruns that don't change the data skip the
+    # Status scan entirely; tabs stash the result in session state so
+    # Analytics reuses it without even a cache lookup
+    return df["Status"].value_counts().reindex(order, fill_value=0)
+
+@st.cache_resource(show_spinner=False)
+def get_store():
+    # Process-global store shared by every session: one disk read and one
+    # in-memory copy of each table no matter how many sessions are open.
+    # Demo data is deliberately shared state; writers must hold the lock.
+    return {
+        "lock": threading.Lock(),
+        "custom_df": load_or_init(CUSTOM_FILE, "custom"),
+        "repair_df": load_or_init(REPAIR_FILE, "repair"),
+    }
 
 def money_fmt(x):
     try:
@@ -120,16 +284,19 @@ st.caption("Custom Orders & Repair tracking system. Works for any service-based
 
 tab1, tab2, tab3 = st.tabs(["Custom Jobs", "Repair Jobs", "Analytics"])
 
-# Load data into session
-
-if "custom_df" not in st.session_state:
-    st.session_state.custom_df = load_or_init_csv(CUSTOM_FILE, "custom")
+# Point session state at the shared store; sessions hold references, not
+# copies, so edits made in one session show up everywhere on the next rerun.
 
-if "repair_df" not in st.session_state:
-    st.session_state.repair_df = load_or_init_csv(REPAIR_FILE, "repair")
+_store = get_store()
+st.session_state.custom_df = _store["custom_df"]
+st.session_state.repair_df = _store["repair_df"]
 
 # CUSTOM JOBS TAB
-with tab1:
+
+@st.fragment
+def custom_tab():
+    # fragment: widget interactions in this tab rerun only this body, not
+    # the other tabs
     st.subheader("Custom Jobs (Consultation → CAD → Production → Pickup)")
     left, right = st.columns([1, 2])
 
@@ -155,9 +322,12 @@ with tab1:
             elif not client.strip():
                 st.error("Client is required.")
             else:
-                total = safe_float(total_price)
-                dep = safe_float(deposit_paid)
-                remaining = compute_remaining(total, dep)
+                # one vectorized coercion at the form boundary, matching the
+                # batch pattern used everywhere else
+                total, dep = pd.to_numeric(
+                    pd.Series([total_price, deposit_paid]), errors="coerce"
+                ).fillna(0.0).tolist()
+                remaining = max(total - dep, 0.0)
                 paid = "Yes" if remaining == 0 else "No"
 
                 new_row = {
@@ -175,51 +345,53 @@ with tab1:
                     "Notes": notes.strip(),
                 }
 
-                df = st.session_state.custom_df.copy()
-                df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
+                # in-place .loc append instead of concat-copying every row
+                df = st.session_state.custom_df.reset_index(drop=True)
+                for c in new_row:
+                    if c not in df.columns:
+                        df[c] = 0.0 if c in MONEY_COLS else ""
+                df.loc[len(df)] = [new_row.get(c) for c in df.columns]
+                # row append widens dtypes; re-narrow Status and money
+                # columns and rederive the balance so the Parquet writer
+                # never sees a mixed object column
+                df = _coerce_money(_with_status_cat(df, "custom"))
+                df["Remaining_Balance"] = np.maximum((df["Total_Price"] - df["Deposit_Paid"]).to_numpy(), 0.0)
+                df["Paid"] = _paid_col(df["Remaining_Balance"])
+                with _store["lock"]:
+                    # persist first so a failed write can't desync the store
+                    append_row_store(CUSTOM_FILE, df)
+                    _store["custom_df"] = df
                 st.session_state.custom_df = df
-                save_csv(df, CUSTOM_FILE)
+                # already persisted: re-baseline so the grown table is not
+                # misread as an editor edit on the next rerun
+                st.session_state.pop("_custom_fp", None)
                 st.success("Custom job added.")
 
         st.markdown("---")
         st.markdown("### Filters")
         f_status = st.multiselect("Status filter", CUSTOM_STATUSES, default=CUSTOM_STATUSES)
         f_paid = st.selectbox("Paid filter", ["All", "Paid", "Unpaid"], index=0)
-        f_search = st.text_input("Search (client / item / order id)", placeholder="type to search")
+        f_search = _search_input("Search (client / item / order id)", placeholder="type to search")
 
     with right:
-        df = st.session_state.custom_df.copy()
-        
-        for col in ["Total_Price", "Deposit_Paid", "Remaining_Balance"]:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0.0)
-
-        # Recompute remaining + paid (to keep consistent)
-        df["Remaining_Balance"] = (df["Total_Price"] - df["Deposit_Paid"]).clip(lower=0.0)
-        df["Paid"] = df["Remaining_Balance"].apply(lambda x: "Yes" if float(x) == 0 else "No")
-
-        # Apply filters
-        df = df[df["Status"].isin(f_status)]
-        if f_paid == "Paid":
-            df = df[df["Paid"] == "Yes"]
-        elif f_paid == "Unpaid":
-            df = df[df["Paid"] == "No"]
-
-        if f_search.strip():
-            q = f_search.strip().lower()
-            mask = (
-                df["Order_ID"].astype(str).str.lower().str.contains(q)
-                | df["Client"].astype(str).str.lower().str.contains(q)
-                | df["Item"].astype(str).str.lower().str.contains(q)
-            )
-            df = df[mask]
-
-        # Summary metrics
+        # normalize + filter in one cached pass
+        df = _normalize_and_filter(
+            st.session_state.custom_df,
+            tuple(f_status),
+            f_paid,
+            f_search,
+            ("Order_ID", "Client", "Item"),
+        )
+
+        # Summary metrics — one value_counts and one sum pass instead of a
+        # fresh comparison/reduction per metric.
+        completed = int(df["Status"].value_counts().get("Completed", 0))
+        sums = df[["Total_Price", "Remaining_Balance"]].sum()
         c1, c2, c3, c4 = st.columns(4)
-        c1.metric("Open jobs", int((df["Status"] != "Completed").sum()))
-        c2.metric("Completed", int((df["Status"] == "Completed").sum()))
-        c3.metric("Total revenue (listed)", money_fmt(df["Total_Price"].sum()))
-        c4.metric("Outstanding balance", money_fmt(df["Remaining_Balance"].sum()))
+        c1.metric("Open jobs", len(df) - completed)
+        c2.metric("Completed", completed)
+        c3.metric("Total revenue (listed)", money_fmt(sums["Total_Price"]))
+        c4.metric("Outstanding balance", money_fmt(sums["Remaining_Balance"]))
 
         st.markdown("### Job table (editable)")
         st.info("You can edit statuses, deposits, notes. Click outside a cell to apply changes.")
@@ -242,10 +414,14 @@ with tab1:
        
         for col in editable_cols:
             if col not in st.session_state.custom_df.columns:
-                st.session_state.custom_df[col] = ""
+                st.session_state.custom_df[col] = 0.0 if col in MONEY_COLS else ""
 
+        # paginate: the editor only ever renders and diffs one page of rows
+        n_pages = max(1, -(-len(st.session_state.custom_df) // PAGE_SIZE))
+        page = int(st.number_input("Page", min_value=1, max_value=n_pages, value=1, key="custom_page"))
+        start = (page - 1) * PAGE_SIZE
         edited = st.data_editor(
-            st.session_state.custom_df[editable_cols],
+            st.session_state.custom_df[editable_cols].iloc[start:start + PAGE_SIZE],
             use_container_width=True,
             hide_index=True,
             column_config={
@@ -260,18 +436,28 @@ with tab1:
 
         # Update session + save if changes
         if edited is not None:
-            df_all = edited.copy()
-            # Fix numeric
-            df_all["Total_Price"] = pd.to_numeric(df_all["Total_Price"], errors="coerce").fillna(0.0)
-            df_all["Deposit_Paid"] = pd.to_numeric(df_all["Deposit_Paid"], errors="coerce").fillna(0.0)
-            df_all["Remaining_Balance"] = (df_all["Total_Price"] - df_all["Deposit_Paid"]).clip(lower=0.0)
-            df_all["Paid"] = df_all["Remaining_Balance"].apply(lambda x: "Yes" if float(x) == 0 else "No")
-
-            st.session_state.custom_df = df_all
-            save_csv(df_all, CUSTOM_FILE)
+            # the editor returns a frame every rerun; only persist real edits,
+            # and reset the baseline whenever the visible page changes
+            fp = (page, _frame_fingerprint(edited))
+            prev = st.session_state.get("_custom_fp")
+            if prev is None or prev[0] != page:
+                st.session_state["_custom_fp"] = fp
+            elif prev != fp:
+                st.session_state["_custom_fp"] = fp
+                # merge the edited page back by index, then rederive
+                df_all = st.session_state.custom_df.copy()
+                df_all.loc[edited.index, editable_cols] = edited
+                df_all = _coerce_money(df_all)
+                df_all["Remaining_Balance"] = np.maximum((df_all["Total_Price"] - df_all["Deposit_Paid"]).to_numpy(), 0.0)
+                df_all["Paid"] = _paid_col(df_all["Remaining_Balance"])
+                with _store["lock"]:
+                    _store["custom_df"] = df_all
+                    save_table(df_all, CUSTOM_FILE)
+                st.session_state.custom_df = df_all
 
         st.markdown("### Stage view (quick scan)")
-        stage_counts = st.session_state.custom_df["Status"].value_counts().reindex(CUSTOM_STATUSES, fill_value=0)
+        stage_counts = _stage_counts(st.session_state.custom_df, CUSTOM_STATUSES)
+        st.session_state["_custom_stage_counts"] = stage_counts
         st.bar_chart(stage_counts)
 
         with st.expander("Export"):
@@ -279,19 +465,28 @@ with tab1:
             with col_a:
                 st.download_button(
                     "Download Custom Jobs CSV",
-                    data=st.session_state.custom_df.to_csv(index=False).encode("utf-8"),
+                    data=_csv_bytes(st.session_state.custom_df),
                     file_name="custom_jobs.csv",
                     mime="text/csv",
                 )
             with col_b:
                 if st.button("Reset demo custom data"):
-                    if os.path.exists(CUSTOM_FILE):
-                        os.remove(CUSTOM_FILE)
-                    st.session_state.custom_df = load_or_init_csv(CUSTOM_FILE, "custom")
+                    with _store["lock"]:
+                        if os.path.exists(CUSTOM_FILE):
+                            os.remove(CUSTOM_FILE)
+                        _read_table_cached.clear()
+                        _store["custom_df"] = load_or_init(CUSTOM_FILE, "custom")
+                    st.session_state.custom_df = _store["custom_df"]
+                    st.session_state.pop("_custom_fp", None)
                     st.success("Reset done (refresh if needed).")
 
+with tab1:
+    custom_tab()
+
 # REPAIR JOBS TAB
-with tab2:
+
+@st.fragment
+def repair_tab():
     st.subheader("Repair Jobs (Intake → Bench → Pickup)")
     left, right = st.columns([1, 2])
 
@@ -318,9 +513,12 @@ with tab2:
             elif not client.strip():
                 st.error("Client is required.")
             else:
-                total = safe_float(total_price)
-                dep = safe_float(deposit_paid)
-                remaining = compute_remaining(total, dep)
+                # one vectorized coercion at the form boundary, matching the
+                # batch pattern used everywhere else
+                total, dep = pd.to_numeric(
+                    pd.Series([total_price, deposit_paid]), errors="coerce"
+                ).fillna(0.0).tolist()
+                remaining = max(total - dep, 0.0)
                 paid = "Yes" if remaining == 0 else "No"
 
                 new_row = {
@@ -339,49 +537,43 @@ with tab2:
                     "Notes": notes.strip(),
                 }
 
-                df = st.session_state.repair_df.copy()
-                df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
+                df = st.session_state.repair_df.reset_index(drop=True)
+                for c in new_row:
+                    if c not in df.columns:
+                        df[c] = 0.0 if c in MONEY_COLS else ""
+                df.loc[len(df)] = [new_row.get(c) for c in df.columns]
+                df = _coerce_money(_with_status_cat(df, "repair"))
+                df["Remaining_Balance"] = np.maximum((df["Total_Price"] - df["Deposit_Paid"]).to_numpy(), 0.0)
+                df["Paid"] = _paid_col(df["Remaining_Balance"])
+                with _store["lock"]:
+                    append_row_store(REPAIR_FILE, df)
+                    _store["repair_df"] = df
                 st.session_state.repair_df = df
-                save_csv(df, REPAIR_FILE)
+                st.session_state.pop("_repair_fp", None)
                 st.success("Repair job added.")
 
         st.markdown("---")
         st.markdown("### Filters")
         f_status = st.multiselect("Status filter", REPAIR_STATUSES, default=REPAIR_STATUSES, key="repair_status_filter")
         f_paid = st.selectbox("Paid filter", ["All", "Paid", "Unpaid"], index=0, key="repair_paid_filter")
-        f_search = st.text_input("Search (client / item / job id)", placeholder="type to search", key="repair_search")
+        f_search = _search_input("Search (client / item / job id)", placeholder="type to search", key="repair_search")
 
     with right:
-        df = st.session_state.repair_df.copy()
-
-        for col in ["Total_Price", "Deposit_Paid", "Remaining_Balance"]:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0.0)
-
-        df["Remaining_Balance"] = (df["Total_Price"] - df["Deposit_Paid"]).clip(lower=0.0)
-        df["Paid"] = df["Remaining_Balance"].apply(lambda x: "Yes" if float(x) == 0 else "No")
-
-        df_f = df[df["Status"].isin(f_status)]
-        if f_paid == "Paid":
-            df_f = df_f[df_f["Paid"] == "Yes"]
-        elif f_paid == "Unpaid":
-            df_f = df_f[df_f["Paid"] == "No"]
-
-        if f_search.strip():
-            q = f_search.strip().lower()
-            mask = (
-                df_f["Order_ID"].astype(str).str.lower().str.contains(q)
-                | df_f["Client"].astype(str).str.lower().str.contains(q)
-                | df_f["Item"].astype(str).str.lower().str.contains(q)
-                | df_f["Repair_Type"].astype(str).str.lower().str.contains(q)
-            )
-            df_f = df_f[mask]
+        df_f = _normalize_and_filter(
+            st.session_state.repair_df,
+            tuple(f_status),
+            f_paid,
+            f_search,
+            ("Order_ID", "Client", "Item", "Repair_Type"),
+        )
 
+        completed = int(df_f["Status"].value_counts().get("Completed", 0))
+        sums = df_f[["Total_Price", "Remaining_Balance"]].sum()
         c1, c2, c3, c4 = st.columns(4)
-        c1.metric("Open repairs", int((df_f["Status"] != "Completed").sum()))
-        c2.metric("Completed", int((df_f["Status"] == "Completed").sum()))
-        c3.metric("Total revenue (listed)", money_fmt(df_f["Total_Price"].sum()))
-        c4.metric("Outstanding balance", money_fmt(df_f["Remaining_Balance"].sum()))
+        c1.metric("Open repairs", len(df_f) - completed)
+        c2.metric("Completed", completed)
+        c3.metric("Total revenue (listed)", money_fmt(sums["Total_Price"]))
+        c4.metric("Outstanding balance", money_fmt(sums["Remaining_Balance"]))
 
         st.markdown("### Repair table (editable)")
         st.info("Edit status, deposits, notes. Remaining/Paid auto-update.")
@@ -403,10 +595,13 @@ with tab2:
         ]
         for col in editable_cols:
             if col not in st.session_state.repair_df.columns:
-                st.session_state.repair_df[col] = ""
+                st.session_state.repair_df[col] = 0.0 if col in MONEY_COLS else ""
 
+        n_pages = max(1, -(-len(st.session_state.repair_df) // PAGE_SIZE))
+        page = int(st.number_input("Page", min_value=1, max_value=n_pages, value=1, key="repair_page"))
+        start = (page - 1) * PAGE_SIZE
         edited = st.data_editor(
-            st.session_state.repair_df[editable_cols],
+            st.session_state.repair_df[editable_cols].iloc[start:start + PAGE_SIZE],
             use_container_width=True,
             hide_index=True,
             column_config={
@@ -420,17 +615,25 @@ with tab2:
         )
 
         if edited is not None:
-            df_all = edited.copy()
-            df_all["Total_Price"] = pd.to_numeric(df_all["Total_Price"], errors="coerce").fillna(0.0)
-            df_all["Deposit_Paid"] = pd.to_numeric(df_all["Deposit_Paid"], errors="coerce").fillna(0.0)
-            df_all["Remaining_Balance"] = (df_all["Total_Price"] - df_all["Deposit_Paid"]).clip(lower=0.0)
-            df_all["Paid"] = df_all["Remaining_Balance"].apply(lambda x: "Yes" if float(x) == 0 else "No")
-
-            st.session_state.repair_df = df_all
-            save_csv(df_all, REPAIR_FILE)
+            fp = (page, _frame_fingerprint(edited))
+            prev = st.session_state.get("_repair_fp")
+            if prev is None or prev[0] != page:
+                st.session_state["_repair_fp"] = fp
+            elif prev != fp:
+                st.session_state["_repair_fp"] = fp
+                df_all = st.session_state.repair_df.copy()
+                df_all.loc[edited.index, editable_cols] = edited
+                df_all = _coerce_money(df_all)
+                df_all["Remaining_Balance"] = np.maximum((df_all["Total_Price"] - df_all["Deposit_Paid"]).to_numpy(), 0.0)
+                df_all["Paid"] = _paid_col(df_all["Remaining_Balance"])
+                with _store["lock"]:
+                    _store["repair_df"] = df_all
+                    save_table(df_all, REPAIR_FILE)
+                st.session_state.repair_df = df_all
 
         st.markdown("### Stage view")
-        stage_counts = st.session_state.repair_df["Status"].value_counts().reindex(REPAIR_STATUSES, fill_value=0)
+        stage_counts = _stage_counts(st.session_state.repair_df, REPAIR_STATUSES)
+        st.session_state["_repair_stage_counts"] = stage_counts
         st.bar_chart(stage_counts)
 
         with st.expander("Export"):
@@ -438,43 +641,55 @@ with tab2:
             with col_a:
                 st.download_button(
                     "Download Repair Jobs CSV",
-                    data=st.session_state.repair_df.to_csv(index=False).encode("utf-8"),
+                    data=_csv_bytes(st.session_state.repair_df),
                     file_name="repair_jobs.csv",
                     mime="text/csv",
                 )
             with col_b:
                 if st.button("Reset demo repair data"):
-                    if os.path.exists(REPAIR_FILE):
-                        os.remove(REPAIR_FILE)
-                    st.session_state.repair_df = load_or_init_csv(REPAIR_FILE, "repair")
+                    with _store["lock"]:
+                        if os.path.exists(REPAIR_FILE):
+                            os.remove(REPAIR_FILE)
+                        _read_table_cached.clear()
+                        _store["repair_df"] = load_or_init(REPAIR_FILE, "repair")
+                    st.session_state.repair_df = _store["repair_df"]
+                    st.session_state.pop("_repair_fp", None)
                     st.success("Reset done (refresh if needed).")
 
+with tab2:
+    repair_tab()
+
 # ANALYTICS TAB
 
-with tab3:
+@st.fragment
+def analytics_tab():
     st.subheader("Analytics (revenue + pipeline)")
-    custom = st.session_state.custom_df.copy()
-    repair = st.session_state.repair_df.copy()
-
-    # Numeric cleanup
-    for df in (custom, repair):
-        for col in ["Total_Price", "Deposit_Paid", "Remaining_Balance"]:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0.0)
-
-    custom["Remaining_Balance"] = (custom["Total_Price"] - custom["Deposit_Paid"]).clip(lower=0.0)
-    repair["Remaining_Balance"] = (repair["Total_Price"] - repair["Deposit_Paid"]).clip(lower=0.0)
-
+    # No .copy(): copy-on-write keeps the session frames intact while
+    # assign() returns derived views for this tab only.
+    custom = st.session_state.custom_df
+    repair = st.session_state.repair_df
+
+    # Money columns are float64 already (coerced at the load/edit boundary);
+    # only the derived balance needs recomputing here.
+    custom = custom.assign(Remaining_Balance=np.maximum((custom["Total_Price"] - custom["Deposit_Paid"]).to_numpy(), 0.0))
+    repair = repair.assign(Remaining_Balance=np.maximum((repair["Total_Price"] - repair["Deposit_Paid"]).to_numpy(), 0.0))
+
+    sums_c = custom[["Total_Price", "Remaining_Balance"]].sum()
+    sums_r = repair[["Total_Price", "Remaining_Balance"]].sum()
     col1, col2, col3 = st.columns(3)
-    col1.metric("Custom revenue (listed)", money_fmt(custom["Total_Price"].sum()))
-    col2.metric("Repair revenue (listed)", money_fmt(repair["Total_Price"].sum()))
-    col3.metric("Total outstanding", money_fmt(custom["Remaining_Balance"].sum() + repair["Remaining_Balance"].sum()))
+    col1.metric("Custom revenue (listed)", money_fmt(sums_c["Total_Price"]))
+    col2.metric("Repair revenue (listed)", money_fmt(sums_r["Total_Price"]))
+    col3.metric("Total outstanding", money_fmt(sums_c["Remaining_Balance"] + sums_r["Remaining_Balance"]))
 
     st.markdown("---")
 
     st.markdown("### Pipeline snapshot")
-    c_stage = custom["Status"].value_counts().reindex(CUSTOM_STATUSES, fill_value=0)
-    r_stage = repair["Status"].value_counts().reindex(REPAIR_STATUSES, fill_value=0)
+    c_stage = st.session_state.get("_custom_stage_counts")
+    if c_stage is None:
+        c_stage = _stage_counts(custom, CUSTOM_STATUSES)
+    r_stage = st.session_state.get("_repair_stage_counts")
+    if r_stage is None:
+        r_stage = _stage_counts(repair, REPAIR_STATUSES)
 
     left, right = st.columns(2)
     with left:
@@ -486,17 +701,25 @@ with tab3:
 
     st.markdown("---")
     st.markdown("### Outstanding balance list (who owes money)")
-    owed_custom = custom[custom["Remaining_Balance"] > 0].copy()
-    owed_custom["Type"] = "Custom"
-    owed_repair = repair[repair["Remaining_Balance"] > 0].copy()
-    owed_repair["Type"] = "Repair"
-
-    owed = pd.concat([owed_custom, owed_repair], ignore_index=True, sort=False)
-    show_cols = [c for c in ["Type", "Order_ID", "Client", "Item", "Status", "Total_Price", "Deposit_Paid", "Remaining_Balance"] if c in owed.columns]
-    if owed.empty:
+    owed_custom = custom[custom["Remaining_Balance"] > 0]
+    owed_repair = repair[repair["Remaining_Balance"] > 0]
+
+    if owed_custom.empty and owed_repair.empty:
         st.success("No outstanding balances in the demo data.")
     else:
-        st.dataframe(owed[show_cols].sort_values("Remaining_Balance", ascending=False), use_container_width=True)
+        # build the combined view in one allocation instead of concat's
+        # copy-and-union pass over two tagged intermediate frames
+        cols = [
+            c for c in ["Order_ID", "Client", "Item", "Status", "Total_Price", "Deposit_Paid", "Remaining_Balance"]
+            if c in owed_custom.columns and c in owed_repair.columns
+        ]
+        data = {"Type": np.repeat(["Custom", "Repair"], [len(owed_custom), len(owed_repair)])}
+        data.update({c: np.concatenate([owed_custom[c].to_numpy(), owed_repair[c].to_numpy()]) for c in cols})
+        owed = pd.DataFrame(data)
+        st.dataframe(owed.sort_values("Remaining_Balance", ascending=False, kind="stable"), use_container_width=True)
 
     st.markdown("---")
     st.caption("Tip: This demo can be extended to Google Sheets, Airtable, or a small database when a shop wants it production-ready.")
+
+with tab3:
+    analytics_tab()
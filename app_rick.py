@@ -4,8 +4,10 @@
 
 from __future__ import annotations
 
+import io
 import os
 from datetime import date
+import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -15,8 +17,8 @@ st.set_page_config(page_title="Rick Terry | Workflow Demo", layout="wide")
 # Rick-specific config
 # -----------------------------
 DATA_DIR = "data_rick"
-CUSTOM_FILE = os.path.join(DATA_DIR, "custom_jobs_rick.csv")
-REPAIR_FILE = os.path.join(DATA_DIR, "repair_jobs_rick.csv")
+CUSTOM_FILE = os.path.join(DATA_DIR, "custom_jobs_rick.feather")
+REPAIR_FILE = os.path.join(DATA_DIR, "repair_jobs_rick.feather")
 
 CAD_TEAM = ["CAD-1", "CAD-2", "CAD-3"]
 BENCH_TEAM = ["Bench-1", "Bench-2", "Bench-3", "Bench-4"]
@@ -46,11 +48,56 @@ REPAIR_STATUSES = [
 
 COMPLEXITY = ["S (Simple)", "M (Medium)", "L (Complex)"]
 
+# Fixed-vocabulary columns kept as pandas Categoricals: filters and
+# value_counts run on int8 codes instead of Python strings.
+CUSTOM_CATEGORIES = {
+    "Status": CUSTOM_STATUSES,
+    "Phase_Owner": ALL_ASSIGNEES,
+    "Complexity": COMPLEXITY,
+}
+REPAIR_CATEGORIES = {
+    "Status": REPAIR_STATUSES,
+    "Assigned_To": BENCH_TEAM,
+    "Complexity": COMPLEXITY,
+}
+
+# Free-text columns held as arrow-backed strings so .str kernels run on
+# contiguous buffers instead of per-row Python objects.
+CUSTOM_TEXT_COLS = ["Job_ID", "Client", "Item", "Notes"]
+REPAIR_TEXT_COLS = ["Job_ID", "Client", "Item", "Repair_Type", "Notes"]
+
+# Known schema of the legacy CSV stores: an explicit dtype map lets the
+# parser skip its type-inference pass.
+CUSTOM_CSV_DTYPES = {
+    "Job_ID": "string", "Client": "string", "Item": "string",
+    "Phase_Owner": "string", "Complexity": "string", "Status": "string",
+    "Intake_Date": "string", "Due_Date": "string",
+    "Total_Price": "float64", "Deposit_Paid": "float64",
+    "Remaining_Balance": "float64", "Paid": "string", "Overdue": "string",
+    "Notes": "string",
+}
+REPAIR_CSV_DTYPES = {
+    "Job_ID": "string", "Client": "string", "Item": "string",
+    "Repair_Type": "string", "Assigned_To": "string", "Complexity": "string",
+    "Status": "string", "Intake_Date": "string", "Promised_Date": "string",
+    "Total_Price": "float64", "Deposit_Paid": "float64",
+    "Remaining_Balance": "float64", "Paid": "string", "Overdue": "string",
+    "Notes": "string",
+}
+
 # -----------------------------
 # Helpers
 # -----------------------------
+_DATA_DIR_READY = False
+
 def ensure_data_dir() -> None:
+    # Called on every load/save; skip the stat+mkdir syscalls once the
+    # directory is known to exist.
+    global _DATA_DIR_READY
+    if _DATA_DIR_READY:
+        return
     os.makedirs(DATA_DIR, exist_ok=True)
+    _DATA_DIR_READY = True
 
 def today_iso() -> str:
     return date.today().isoformat()
@@ -61,25 +108,15 @@ def to_float(x) -> float:
     except Exception:
         return 0.0
 
-def compute_remaining(total: float, deposit: float) -> float:
-    rem = total - deposit
-    return rem if rem >= 0 else 0.0
-
-def parse_date(s: str):
-    try:
-        if isinstance(s, str) and s.strip():
-            return pd.to_datetime(s).date()
-    except Exception:
-        return None
-    return None
+def _overdue_mask(due_series: pd.Series, status_series: pd.Series) -> pd.Series:
+    # One C-level datetime parse + compare instead of a Python call per row.
+    d = pd.to_datetime(due_series, errors="coerce")
+    today = pd.Timestamp(date.today())
+    return (status_series != "Completed") & d.notna() & (d < today)
 
-def is_overdue(due_str: str, status: str) -> str:
-    if status == "Completed":
-        return "No"
-    d = parse_date(due_str)
-    if d and d < date.today():
-        return "Yes"
-    return "No"
+def _frame_fingerprint(df: pd.DataFrame) -> bytes:
+    # Cheap content hash used to detect real edits before writing to disk.
+    return pd.util.hash_pandas_object(df, index=False).values.tobytes()
 
 def money_fmt(x) -> str:
     try:
@@ -87,11 +124,90 @@ def money_fmt(x) -> str:
     except Exception:
         return "$0.00"
 
+@st.cache_data(
+    show_spinner=False,
+    hash_funcs={pd.DataFrame: lambda d: (len(d), pd.util.hash_pandas_object(d, index=False).sum())},
+)
+def _derive(df: pd.DataFrame, date_col: str) -> pd.DataFrame:
+    # Single derived-column pass shared by all tabs; the cheap content
+    # fingerprint lets the Front Desk view reuse the tab results instead of
+    # recomputing both frames every rerun. _Paid/_Overdue are the working
+    # bool columns (1 byte/row, branchless filters); the Yes/No string
+    # twins exist only for display and the on-disk schema.
+    return df.assign(
+        Total_Price=lambda d: pd.to_numeric(d["Total_Price"], errors="coerce").fillna(0.0),
+        Deposit_Paid=lambda d: pd.to_numeric(d["Deposit_Paid"], errors="coerce").fillna(0.0),
+        Remaining_Balance=lambda d: (d["Total_Price"] - d["Deposit_Paid"]).clip(lower=0.0),
+        _Paid=lambda d: d["Remaining_Balance"].to_numpy() == 0.0,
+        _Overdue=lambda d: _overdue_mask(d[date_col], d["Status"]),
+        Paid=lambda d: np.where(d["_Paid"], "Yes", "No"),
+        Overdue=lambda d: np.where(d["_Overdue"], "Yes", "No"),
+    )
+
+@st.cache_data(
+    show_spinner=False,
+    hash_funcs={pd.Series: lambda s: (len(s), pd.util.hash_pandas_object(s, index=False).sum())},
+)
+def _stage_counts(values: pd.Series, order: tuple[str, ...]) -> pd.Series:
+    # Memoized counts for the bar charts; unchanged data skips the scan.
+    return values.value_counts().reindex(list(order), fill_value=0)
+
+@st.cache_data(show_spinner=False)
+def _search_hay(df: pd.DataFrame, cols: tuple[str, ...]) -> pd.Series:
+    # One concatenated lowercase haystack per frame (cached): the search
+    # filter then makes a single contains() sweep instead of one full scan
+    # per column. \x1f separates fields so matches cannot span columns.
+    hay = df[cols[0]].astype(str)
+    for c in cols[1:]:
+        hay = hay + "\x1f" + df[c].astype(str)
+    return hay.str.lower()
+
+@st.cache_data(
+    show_spinner=False,
+    hash_funcs={pd.DataFrame: lambda d: (len(d), pd.util.hash_pandas_object(d, index=False).sum())},
+)
+def _csv_bytes(df: pd.DataFrame) -> bytes:
+    # Serialize straight into a bytes buffer: no str->bytes recopy, and the
+    # cache means reruns don't re-serialize an unchanged frame.
+    buf = io.BytesIO()
+    _drop_internal_cols(df).to_csv(buf, index=False)
+    return buf.getvalue()
+
+@st.cache_data(show_spinner=False)
+def _read_table_cached(path: str, mtime: float) -> pd.DataFrame:
+    # mtime is part of the cache key so on-disk edits invalidate the entry.
+    return pd.read_feather(path)
+
+def _apply_categories(df: pd.DataFrame, kind: str) -> pd.DataFrame:
+    categories = CUSTOM_CATEGORIES if kind == "custom" else REPAIR_CATEGORIES
+    for col, cats in categories.items():
+        if col in df.columns:
+            df[col] = pd.Categorical(df[col], categories=cats)
+    text_cols = CUSTOM_TEXT_COLS if kind == "custom" else REPAIR_TEXT_COLS
+    for col in text_cols:
+        if col in df.columns:
+            df[col] = df[col].astype("string[pyarrow]")
+    return df
+
 def load_or_init(path: str, kind: str) -> pd.DataFrame:
     ensure_data_dir()
     if os.path.exists(path):
-        df = pd.read_csv(path)
+        return _apply_categories(_read_table_cached(path, os.path.getmtime(path)).copy(), kind)
+
+    legacy_csv = os.path.splitext(path)[0] + ".csv"
+    if os.path.exists(legacy_csv):
+        # One-time migration from the pre-Feather CSV store; pyarrow's
+        # reader tokenizes in parallel, the default engine is the fallback.
+        dtypes = CUSTOM_CSV_DTYPES if kind == "custom" else REPAIR_CSV_DTYPES
+        try:
+            df = pd.read_csv(legacy_csv, engine="pyarrow", dtype=dtypes)
+        except (ImportError, ValueError):
+            df = pd.read_csv(legacy_csv, dtype=dtypes)
         df.columns = [c.strip() for c in df.columns]
+        df = _apply_categories(df, kind)
+        df.reset_index(drop=True).to_feather(path)
+        # retire the CSV so a later demo reset cannot resurrect stale rows
+        os.replace(legacy_csv, legacy_csv + ".bak")
         return df
 
     if kind == "custom":
@@ -138,12 +254,33 @@ def load_or_init(path: str, kind: str) -> pd.DataFrame:
             ]
         )
 
-    df.to_csv(path, index=False)
+    df = _apply_categories(df, kind)
+    df.reset_index(drop=True).to_feather(path)
     return df
 
+def _flush_pending(df: pd.DataFrame, pending_key: str, kind: str) -> pd.DataFrame:
+    # Materialize buffered adds; copy-on-write keeps untouched columns shared.
+    pending = st.session_state.get(pending_key) or []
+    if not pending:
+        return df
+    # .loc appends on a RangeIndex: no one-row frame construction, so no
+    # per-column dtype inference for every add.
+    df = df.reset_index(drop=True)
+    for row in pending:
+        df.loc[len(df)] = [row.get(c) for c in df.columns]
+    st.session_state[pending_key] = []
+    # enlargement can degrade Categoricals to object
+    return _apply_categories(df, kind)
+
+def _drop_internal_cols(df: pd.DataFrame) -> pd.DataFrame:
+    return df.drop(columns=[c for c in df.columns if c.startswith("_")])
+
 def save_df(df: pd.DataFrame, path: str) -> None:
     ensure_data_dir()
-    df.to_csv(path, index=False)
+    # Feather is much faster to read/write than CSV; CSV is only generated
+    # on demand for the download buttons. Working bool columns stay in
+    # memory only.
+    _drop_internal_cols(df).reset_index(drop=True).to_feather(path)
 
 # -----------------------------
 # Load session state
@@ -154,6 +291,9 @@ if "custom_df_rick" not in st.session_state:
 if "repair_df_rick" not in st.session_state:
     st.session_state.repair_df_rick = load_or_init(REPAIR_FILE, "repair")
 
+st.session_state.setdefault("custom_pending_rick", [])
+st.session_state.setdefault("repair_pending_rick", [])
+
 # -----------------------------
 # Header
 # -----------------------------
@@ -192,11 +332,10 @@ with tab1:
             else:
                 total = to_float(total_price)
                 dep = to_float(deposit_paid)
-                rem = compute_remaining(total, dep)
-                paid = "Yes" if rem == 0 else "No"
                 due_str = due_date.isoformat() if due_date else ""
-                overdue = is_overdue(due_str, status)
 
+                # Remaining/Paid/Overdue come out of the vectorized _derive
+                # pass below, so no per-value scalar recompute here.
                 new_row = {
                     "Job_ID": job_id.strip(),
                     "Client": client.strip(),
@@ -208,23 +347,20 @@ with tab1:
                     "Due_Date": due_str,
                     "Total_Price": total,
                     "Deposit_Paid": dep,
-                    "Remaining_Balance": rem,
-                    "Paid": paid,
-                    "Overdue": overdue,
                     "Notes": notes.strip(),
                 }
 
-                df = st.session_state.custom_df_rick.copy()
-                df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-                # recompute to be safe
-                df["Total_Price"] = pd.to_numeric(df["Total_Price"], errors="coerce").fillna(0.0)
-                df["Deposit_Paid"] = pd.to_numeric(df["Deposit_Paid"], errors="coerce").fillna(0.0)
-                df["Remaining_Balance"] = (df["Total_Price"] - df["Deposit_Paid"]).clip(lower=0.0)
-                df["Paid"] = df["Remaining_Balance"].apply(lambda x: "Yes" if float(x) == 0 else "No")
-                df["Overdue"] = df.apply(lambda r: is_overdue(str(r.get("Due_Date", "")), str(r.get("Status", ""))), axis=1)
+                st.session_state.custom_pending_rick.append(new_row)
+                df = _flush_pending(st.session_state.custom_df_rick, "custom_pending_rick", "custom")
+                df = _derive(df, "Due_Date")
 
                 st.session_state.custom_df_rick = df
                 save_df(df, CUSTOM_FILE)
+                # the add write persists the whole frame, pending edits
+                # included; drop the editor baseline so the grown table is
+                # not misread as an unsaved edit on the next rerun
+                st.session_state.pop("custom_rick_hash", None)
+                st.session_state.custom_dirty_rick = False
                 st.success("Custom job added.")
 
         st.markdown("---")
@@ -235,35 +371,26 @@ with tab1:
         f_search = st.text_input("Search (job/client/item)", placeholder="type to search")
 
     with right:
-        df = st.session_state.custom_df_rick.copy()
-
-        # numeric + recompute
-        df["Total_Price"] = pd.to_numeric(df.get("Total_Price", 0), errors="coerce").fillna(0.0)
-        df["Deposit_Paid"] = pd.to_numeric(df.get("Deposit_Paid", 0), errors="coerce").fillna(0.0)
-        df["Remaining_Balance"] = (df["Total_Price"] - df["Deposit_Paid"]).clip(lower=0.0)
-        df["Paid"] = df["Remaining_Balance"].apply(lambda x: "Yes" if float(x) == 0 else "No")
-        df["Overdue"] = df.apply(lambda r: is_overdue(str(r.get("Due_Date", "")), str(r.get("Status", ""))), axis=1)
+        # numeric + recompute (cached per frame content)
+        df = _derive(st.session_state.custom_df_rick, "Due_Date")
 
         # apply filters
         df_f = df[df["Status"].isin(f_status)]
         df_f = df_f[df_f["Phase_Owner"].isin(f_owner)]
         if f_overdue == "Only overdue":
-            df_f = df_f[df_f["Overdue"] == "Yes"]
+            df_f = df_f[df_f["_Overdue"]]
         elif f_overdue == "Not overdue":
-            df_f = df_f[df_f["Overdue"] == "No"]
+            df_f = df_f[~df_f["_Overdue"]]
 
         if f_search.strip():
             q = f_search.strip().lower()
-            mask = (
-                df_f["Job_ID"].astype(str).str.lower().str.contains(q)
-                | df_f["Client"].astype(str).str.lower().str.contains(q)
-                | df_f["Item"].astype(str).str.lower().str.contains(q)
-            )
-            df_f = df_f[mask]
+            hay = _search_hay(df, ("Job_ID", "Client", "Item"))
+            mask = hay.str.contains(q, regex=False, na=False)
+            df_f = df_f[mask.loc[df_f.index]]
 
         c1, c2, c3, c4 = st.columns(4)
         c1.metric("Open customs", int((df_f["Status"] != "Completed").sum()))
-        c2.metric("Overdue", int((df_f["Overdue"] == "Yes").sum()))
+        c2.metric("Overdue", int(df_f["_Overdue"].sum()))
         c3.metric("Listed revenue", money_fmt(df_f["Total_Price"].sum()))
         c4.metric("Outstanding", money_fmt(df_f["Remaining_Balance"].sum()))
 
@@ -300,31 +427,45 @@ with tab1:
         )
 
         if edited is not None:
-            df2 = edited.copy()
-            df2["Total_Price"] = pd.to_numeric(df2["Total_Price"], errors="coerce").fillna(0.0)
-            df2["Deposit_Paid"] = pd.to_numeric(df2["Deposit_Paid"], errors="coerce").fillna(0.0)
-            df2["Remaining_Balance"] = (df2["Total_Price"] - df2["Deposit_Paid"]).clip(lower=0.0)
-            df2["Paid"] = df2["Remaining_Balance"].apply(lambda x: "Yes" if float(x) == 0 else "No")
-            df2["Overdue"] = df2.apply(lambda r: is_overdue(str(r.get("Due_Date", "")), str(r.get("Status", ""))), axis=1)
-
-            st.session_state.custom_df_rick = df2
-            save_df(df2, CUSTOM_FILE)
+            df2 = _derive(edited, "Due_Date")
+
+            # The editor returns a frame on every rerun; edits only mark the
+            # frame dirty, the full-table write happens on explicit save.
+            new_hash = _frame_fingerprint(df2)
+            prev_hash = st.session_state.get("custom_rick_hash")
+            if prev_hash is None:
+                st.session_state.custom_rick_hash = new_hash
+            elif prev_hash != new_hash:
+                st.session_state.custom_rick_hash = new_hash
+                st.session_state.custom_df_rick = df2
+                st.session_state.custom_dirty_rick = True
+
+        if st.session_state.get("custom_dirty_rick"):
+            if st.button("Save changes", key="save_custom_rick"):
+                save_df(st.session_state.custom_df_rick, CUSTOM_FILE)
+                st.session_state.custom_dirty_rick = False
+                st.success("Changes saved.")
+            else:
+                st.warning("Unsaved table edits — click 'Save changes' to write them to disk.")
 
         st.markdown("### Pipeline view")
-        stage_counts = st.session_state.custom_df_rick["Status"].value_counts().reindex(CUSTOM_STATUSES, fill_value=0)
+        stage_counts = _stage_counts(st.session_state.custom_df_rick["Status"], tuple(CUSTOM_STATUSES))
         st.bar_chart(stage_counts)
 
         with st.expander("Export / Reset"):
             st.download_button(
                 "Download custom CSV",
-                data=st.session_state.custom_df_rick.to_csv(index=False).encode("utf-8"),
+                data=_csv_bytes(st.session_state.custom_df_rick),
                 file_name="custom_jobs_rick.csv",
                 mime="text/csv",
             )
             if st.button("Reset Rick custom demo data"):
                 if os.path.exists(CUSTOM_FILE):
                     os.remove(CUSTOM_FILE)
+                _read_table_cached.clear()
                 st.session_state.custom_df_rick = load_or_init(CUSTOM_FILE, "custom")
+                st.session_state.pop("custom_rick_hash", None)
+                st.session_state.custom_dirty_rick = False
                 st.success("Reset done.")
 
 # -----------------------------
@@ -358,10 +499,7 @@ with tab2:
             else:
                 total = to_float(total_price)
                 dep = to_float(deposit_paid)
-                rem = compute_remaining(total, dep)
-                paid = "Yes" if rem == 0 else "No"
                 prom_str = promised.isoformat() if promised else ""
-                overdue = is_overdue(prom_str, status)
 
                 new_row = {
                     "Job_ID": job_id.strip(),
@@ -375,23 +513,17 @@ with tab2:
                     "Promised_Date": prom_str,
                     "Total_Price": total,
                     "Deposit_Paid": dep,
-                    "Remaining_Balance": rem,
-                    "Paid": paid,
-                    "Overdue": overdue,
                     "Notes": notes.strip(),
                 }
 
-                df = st.session_state.repair_df_rick.copy()
-                df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-
-                df["Total_Price"] = pd.to_numeric(df["Total_Price"], errors="coerce").fillna(0.0)
-                df["Deposit_Paid"] = pd.to_numeric(df["Deposit_Paid"], errors="coerce").fillna(0.0)
-                df["Remaining_Balance"] = (df["Total_Price"] - df["Deposit_Paid"]).clip(lower=0.0)
-                df["Paid"] = df["Remaining_Balance"].apply(lambda x: "Yes" if float(x) == 0 else "No")
-                df["Overdue"] = df.apply(lambda r: is_overdue(str(r.get("Promised_Date", "")), str(r.get("Status", ""))), axis=1)
+                st.session_state.repair_pending_rick.append(new_row)
+                df = _flush_pending(st.session_state.repair_df_rick, "repair_pending_rick", "repair")
+                df = _derive(df, "Promised_Date")
 
                 st.session_state.repair_df_rick = df
                 save_df(df, REPAIR_FILE)
+                st.session_state.pop("repair_rick_hash", None)
+                st.session_state.repair_dirty_rick = False
                 st.success("Repair job added.")
 
         st.markdown("---")
@@ -402,35 +534,25 @@ with tab2:
         f_search = st.text_input("Search (job/client/item/repair)", placeholder="type to search", key="rep_search_f")
 
     with right:
-        df = st.session_state.repair_df_rick.copy()
-
-        df["Total_Price"] = pd.to_numeric(df.get("Total_Price", 0), errors="coerce").fillna(0.0)
-        df["Deposit_Paid"] = pd.to_numeric(df.get("Deposit_Paid", 0), errors="coerce").fillna(0.0)
-        df["Remaining_Balance"] = (df["Total_Price"] - df["Deposit_Paid"]).clip(lower=0.0)
-        df["Paid"] = df["Remaining_Balance"].apply(lambda x: "Yes" if float(x) == 0 else "No")
-        df["Overdue"] = df.apply(lambda r: is_overdue(str(r.get("Promised_Date", "")), str(r.get("Status", ""))), axis=1)
+        df = _derive(st.session_state.repair_df_rick, "Promised_Date")
 
         df_f = df[df["Status"].isin(f_status)]
         df_f = df_f[df_f["Assigned_To"].isin(f_bench)]
 
         if f_overdue == "Only overdue":
-            df_f = df_f[df_f["Overdue"] == "Yes"]
+            df_f = df_f[df_f["_Overdue"]]
         elif f_overdue == "Not overdue":
-            df_f = df_f[df_f["Overdue"] == "No"]
+            df_f = df_f[~df_f["_Overdue"]]
 
         if f_search.strip():
             q = f_search.strip().lower()
-            mask = (
-                df_f["Job_ID"].astype(str).str.lower().str.contains(q)
-                | df_f["Client"].astype(str).str.lower().str.contains(q)
-                | df_f["Item"].astype(str).str.lower().str.contains(q)
-                | df_f["Repair_Type"].astype(str).str.lower().str.contains(q)
-            )
-            df_f = df_f[mask]
+            hay = _search_hay(df, ("Job_ID", "Client", "Item", "Repair_Type"))
+            mask = hay.str.contains(q, regex=False, na=False)
+            df_f = df_f[mask.loc[df_f.index]]
 
         c1, c2, c3, c4 = st.columns(4)
         c1.metric("Open repairs", int((df_f["Status"] != "Completed").sum()))
-        c2.metric("Overdue", int((df_f["Overdue"] == "Yes").sum()))
+        c2.metric("Overdue", int(df_f["_Overdue"].sum()))
         c3.metric("Listed revenue", money_fmt(df_f["Total_Price"].sum()))
         c4.metric("Outstanding", money_fmt(df_f["Remaining_Balance"].sum()))
 
@@ -465,33 +587,45 @@ with tab2:
         )
 
         if edited is not None:
-            df2 = edited.copy()
-            df2["Total_Price"] = pd.to_numeric(df2["Total_Price"], errors="coerce").fillna(0.0)
-            df2["Deposit_Paid"] = pd.to_numeric(df2["Deposit_Paid"], errors="coerce").fillna(0.0)
-            df2["Remaining_Balance"] = (df2["Total_Price"] - df2["Deposit_Paid"]).clip(lower=0.0)
-            df2["Paid"] = df2["Remaining_Balance"].apply(lambda x: "Yes" if float(x) == 0 else "No")
-            df2["Overdue"] = df2.apply(lambda r: is_overdue(str(r.get("Promised_Date", "")), str(r.get("Status", ""))), axis=1)
-
-            st.session_state.repair_df_rick = df2
-            save_df(df2, REPAIR_FILE)
+            df2 = _derive(edited, "Promised_Date")
+
+            new_hash = _frame_fingerprint(df2)
+            prev_hash = st.session_state.get("repair_rick_hash")
+            if prev_hash is None:
+                st.session_state.repair_rick_hash = new_hash
+            elif prev_hash != new_hash:
+                st.session_state.repair_rick_hash = new_hash
+                st.session_state.repair_df_rick = df2
+                st.session_state.repair_dirty_rick = True
+
+        if st.session_state.get("repair_dirty_rick"):
+            if st.button("Save changes", key="save_repair_rick"):
+                save_df(st.session_state.repair_df_rick, REPAIR_FILE)
+                st.session_state.repair_dirty_rick = False
+                st.success("Changes saved.")
+            else:
+                st.warning("Unsaved table edits — click 'Save changes' to write them to disk.")
 
         st.markdown("### Repair load by bench")
         load = st.session_state.repair_df_rick.copy()
         load = load[load["Status"] != "Completed"]
-        counts = load["Assigned_To"].value_counts().reindex(BENCH_TEAM, fill_value=0)
+        counts = _stage_counts(load["Assigned_To"], tuple(BENCH_TEAM))
         st.bar_chart(counts)
 
         with st.expander("Export / Reset"):
             st.download_button(
                 "Download repair CSV",
-                data=st.session_state.repair_df_rick.to_csv(index=False).encode("utf-8"),
+                data=_csv_bytes(st.session_state.repair_df_rick),
                 file_name="repair_jobs_rick.csv",
                 mime="text/csv",
             )
             if st.button("Reset Rick repair demo data"):
                 if os.path.exists(REPAIR_FILE):
                     os.remove(REPAIR_FILE)
+                _read_table_cached.clear()
                 st.session_state.repair_df_rick = load_or_init(REPAIR_FILE, "repair")
+                st.session_state.pop("repair_rick_hash", None)
+                st.session_state.repair_dirty_rick = False
                 st.success("Reset done.")
 
 # -----------------------------
@@ -500,26 +634,17 @@ with tab2:
 with tab3:
     st.subheader("Front Desk Views (what matters daily)")
 
-    custom = st.session_state.custom_df_rick.copy()
-    repair = st.session_state.repair_df_rick.copy()
-
-    for df in (custom, repair):
-        df["Total_Price"] = pd.to_numeric(df.get("Total_Price", 0), errors="coerce").fillna(0.0)
-        df["Deposit_Paid"] = pd.to_numeric(df.get("Deposit_Paid", 0), errors="coerce").fillna(0.0)
-        df["Remaining_Balance"] = (df["Total_Price"] - df["Deposit_Paid"]).clip(lower=0.0)
-        df["Paid"] = df["Remaining_Balance"].apply(lambda x: "Yes" if float(x) == 0 else "No")
-
-    custom["Overdue"] = custom.apply(lambda r: is_overdue(str(r.get("Due_Date", "")), str(r.get("Status", ""))), axis=1)
-    repair["Overdue"] = repair.apply(lambda r: is_overdue(str(r.get("Promised_Date", "")), str(r.get("Status", ""))), axis=1)
+    custom = _derive(st.session_state.custom_df_rick, "Due_Date")
+    repair = _derive(st.session_state.repair_df_rick, "Promised_Date")
 
     col1, col2, col3 = st.columns(3)
-    col1.metric("Pickup-ready customs (unpaid)", int(((custom["Status"] == "Ready for Pickup") & (custom["Paid"] == "No")).sum()))
-    col2.metric("Overdue customs", int((custom["Overdue"] == "Yes").sum()))
-    col3.metric("Overdue repairs", int((repair["Overdue"] == "Yes").sum()))
+    col1.metric("Pickup-ready customs (unpaid)", int(((custom["Status"] == "Ready for Pickup") & ~custom["_Paid"]).sum()))
+    col2.metric("Overdue customs", int(custom["_Overdue"].sum()))
+    col3.metric("Overdue repairs", int(repair["_Overdue"].sum()))
 
     st.markdown("---")
     st.markdown("### Pickup-ready but unpaid (Custom)")
-    pickup_unpaid = custom[(custom["Status"] == "Ready for Pickup") & (custom["Paid"] == "No")].copy()
+    pickup_unpaid = custom[(custom["Status"] == "Ready for Pickup") & ~custom["_Paid"]]
     if pickup_unpaid.empty:
         st.success("No pickup-ready unpaid custom jobs in demo data.")
     else:
@@ -527,7 +652,7 @@ with tab3:
         st.dataframe(pickup_unpaid[show_cols], use_container_width=True, hide_index=True)
 
     st.markdown("### Repairs ready for pickup (unpaid)")
-    rep_ready_unpaid = repair[(repair["Status"] == "Ready for Pickup") & (repair["Paid"] == "No")].copy()
+    rep_ready_unpaid = repair[(repair["Status"] == "Ready for Pickup") & ~repair["_Paid"]]
     if rep_ready_unpaid.empty:
         st.info("No pickup-ready unpaid repair jobs in demo data.")
     else:
@@ -536,13 +661,18 @@ with tab3:
 
     st.markdown("---")
     st.markdown("### Overdue list (Custom + Repair)")
-    custom_over = custom[custom["Overdue"] == "Yes"].copy()
-    custom_over["Type"] = "Custom"
-    repair_over = repair[repair["Overdue"] == "Yes"].copy()
-    repair_over["Type"] = "Repair"
-    over = pd.concat([custom_over, repair_over], ignore_index=True, sort=False)
+    over_cols = ["Type", "Job_ID", "Client", "Item", "Status", "Phase_Owner", "Assigned_To", "Due_Date", "Promised_Date"]
+    # Project each side down to the display columns before concat so the
+    # union of all store columns never gets aligned and copied.
+    parts = []
+    for src, label in ((custom, "Custom"), (repair, "Repair")):
+        part = src[src["_Overdue"]].assign(Type=label)
+        for c in over_cols:
+            if c not in part.columns:
+                part[c] = ""
+        parts.append(part[over_cols])
+    over = pd.concat(parts, ignore_index=True)
     if over.empty:
         st.success("No overdue jobs in demo data.")
     else:
-        cols = [c for c in ["Type", "Job_ID", "Client", "Item", "Status", "Phase_Owner", "Assigned_To", "Due_Date", "Promised_Date"] if c in over.columns]
-        st.dataframe(over[cols], use_container_width=True, hide_index=True)
+        st.dataframe(over, use_container_width=True, hide_index=True)